@@ -1,17 +1,29 @@
 import asyncio
+import aiohttp
+import gzip
+import hashlib
+import heapq
 import json
+import orjson
 import time
 import requests
+import socket
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import subprocess
-import threading
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
 import yaml
 import os
-from flask import Flask, jsonify, render_template_string
+from quart import Quart, Response, request
+from hypercorn.asyncio import serve
+from hypercorn.config import Config as HypercornConfig
+from jinja2 import Environment
+from markupsafe import Markup, escape
 from supabase import create_client, Client
 
-# Template HTML untuk dashboard Flask
+# Template HTML untuk dashboard Quart
 DASHBOARD_TEMPLATE = """
 <!DOCTYPE html>
 <html lang="en">
@@ -31,13 +43,13 @@ DASHBOARD_TEMPLATE = """
 <body>
     <div class="container">
         <h1>FMAA BDI Agent Dashboard</h1>
-        <p>Last Updated: {{ beliefs.last_updated }}</p>
+        <p>Last Updated: {{ last_updated }}</p>
         <h2>Beliefs (Current System State)</h2>
-        <pre>{{ beliefs | tojson(indent=2) }}</pre>
+        <pre>{{ beliefs_json }}</pre>
         <h2>Desires (Goals)</h2>
-        <pre>{{ desires | tojson(indent=2) }}</pre>
+        <pre>{{ desires_json }}</pre>
         <h2>Intentions (Actions)</h2>
-        <pre>{{ intentions | tojson(indent=2) }}</pre>
+        <pre>{{ intentions_json }}</pre>
         <h2>System Status</h2>
         <p>Running: <span class="{{ 'status-ok' if running else 'status-error' }}">{{ 'True' if running else 'False' }}</span></p>
     </div>
@@ -45,66 +57,121 @@ DASHBOARD_TEMPLATE = """
 </html>
 """
 
+PING_TIMEOUT = aiohttp.ClientTimeout(total=5)
+CLOUD_STATUS_TTL = 300  # detik; status cloud jarang berubah antar siklus
+DASHBOARD_CACHE_CONTROL = 'max-age=5'
+BREAKER_THRESHOLD = 3  # kegagalan beruntun sebelum ping dilewati
+BREAKER_MAX_BACKOFF = 600  # detik; jarak maksimum antar ping ke endpoint yang sedang down
+# Dalam jumlah refresh yang dilewati: melewati n refresh berarti ping berikutnya (n + 1) * CLOUD_STATUS_TTL kemudian
+BREAKER_MAX_SKIPS = max(1, BREAKER_MAX_BACKOFF // CLOUD_STATUS_TTL - 1)
+GZIP_MIN_SIZE = 500  # byte; respons lebih kecil tidak sepadan dikompresi
+
+def prepare_body(body: bytes) -> Dict:
+    # Dihitung sekali per siklus BDI: ETag (weak, karena isi bisa di-gzip) dan varian gzip bila cukup besar
+    return {'body': body, 'etag': hashlib.md5(body, usedforsecurity=False).hexdigest(), 'gzip': gzip.compress(body, compresslevel=6) if len(body) >= GZIP_MIN_SIZE else None}
+
+def cacheable_response(prepared: Dict, mimetype: str) -> Response:
+    # Per request hanya mencocokkan If-None-Match (polling berulang dijawab 304 tanpa body) dan memilih varian
+    headers = {'Cache-Control': DASHBOARD_CACHE_CONTROL, 'Vary': 'Accept-Encoding'}
+    if request.if_none_match.contains_weak(prepared['etag']): response = Response(b'', status=304, headers=headers)
+    elif prepared['gzip'] is not None and request.accept_encodings.quality('gzip') > 0:
+        response = Response(prepared['gzip'], mimetype=mimetype, headers={**headers, 'Content-Encoding': 'gzip'})
+    else: response = Response(prepared['body'], mimetype=mimetype, headers=headers)
+    response.set_etag(prepared['etag'], weak=True); return response
+
+def format_ts(ts: Optional[float]) -> Optional[str]:
+    return datetime.fromtimestamp(ts).isoformat() if ts is not None else None
+
+def pretty_json(data) -> str:
+    return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode()
+
+@dataclass
+class CircuitState:
+    failures: int = 0
+    skip_remaining: int = 0
+
 class BeliefSystem:
     def __init__(self, config: Dict):
-        self.config = config
-        self.beliefs = {'system_health': 100, 'resource_usage': 0, 'active_agents': [], 'revenue_metrics': {}, 'cloud_status': {}, 'last_updated': None}
+        self.config = config; self.http: Optional[aiohttp.ClientSession] = None; self._cloud_cache = {'ts': 0.0, 'data': {}}; self._breakers: Dict[str, CircuitState] = {}
+        self.beliefs = {'system_health': 100, 'resource_usage': 0, 'active_agents': [], 'revenue_metrics': {}, 'cloud_status': {}, 'last_updated_ts': None}
+        self._get_resource_usage()  # priming: cpu_percent(None) pertama selalu 0.0
+        self.supabase_url = config['cloud_services']['supabase']['url']; self.supabase_key = (config.get('secrets') or {}).get('SUPABASE_KEY')
+        self._supabase_ping_headers = {'apikey': self.supabase_key} if self.supabase_key else {}
+        try: self.supabase: Optional[Client] = create_client(self.supabase_url, self.supabase_key)
+        except Exception as e: print(f"⚠️  Could not create Supabase client ({e}), revenue metrics will use placeholder."); self.supabase = None
 
     async def update_beliefs(self):
         try:
-            self.beliefs['resource_usage'] = self._get_resource_usage()
-            self.beliefs['cloud_status'] = await self._check_cloud_services()
-            self.beliefs['revenue_metrics'] = await self._fetch_revenue_metrics()
-            self.beliefs['last_updated'] = datetime.now().isoformat()
+            loop = asyncio.get_event_loop()
+            cloud, revenue, cpu = await asyncio.gather(self._check_cloud_services(), self._fetch_revenue_metrics(), loop.run_in_executor(None, self._get_resource_usage))
+            self.beliefs['resource_usage'] = cpu; self.beliefs['cloud_status'] = cloud; self.beliefs['revenue_metrics'] = revenue
+            self.beliefs['last_updated_ts'] = time.time()
             print(f"🧠 Beliefs Updated: {self.beliefs['system_health']}% System Health")
         except Exception as e: print(f"❌ Belief Update Error: {e}")
 
     def _get_resource_usage(self) -> float:
         try:
             import psutil
-            return psutil.cpu_percent(interval=1)
+            return psutil.cpu_percent(interval=None)
         except Exception as e:
             print(f"⚠️  Could not get CPU usage ({e}), using fallback.")
             return 5.0
 
+    def invalidate_cloud_cache(self):
+        self._cloud_cache = {'ts': 0.0, 'data': {}}
+
     async def _check_cloud_services(self) -> Dict:
-        return {'github_actions': await self._ping_github(), 'vercel_api': await self._ping_vercel(), 'supabase_db': await self._ping_supabase(), 'huggingface': await self._ping_huggingface()}
+        cache = self._cloud_cache
+        if cache['data'] and time.monotonic() - cache['ts'] < CLOUD_STATUS_TTL: return cache['data']
+        github, vercel, supa, hf = await asyncio.gather(self._with_breaker('github_actions', self._ping_github), self._with_breaker('vercel_api', self._ping_vercel), self._with_breaker('supabase_db', self._ping_supabase), self._with_breaker('huggingface', self._ping_huggingface), return_exceptions=True)
+        results = (('github_actions', github), ('vercel_api', vercel), ('supabase_db', supa), ('huggingface', hf))
+        for name, ok in results:
+            if isinstance(ok, Exception): print(f"❌ {name} ping error (not counted as outage): {ok!r}")
+        status = {name: ok is True for name, ok in results}
+        self._cloud_cache = {'ts': time.monotonic(), 'data': status}; return status
+
+    async def _with_breaker(self, name: str, ping) -> bool:
+        # Endpoint yang terus gagal dilewati pada beberapa refresh berikutnya (eksponensial). Dihitung per refresh,
+        # bukan per detik, karena jarak antar ping berubah: CLOUD_STATUS_TTL, atau tiap siklus setelah invalidasi
+        state = self._breakers.setdefault(name, CircuitState())
+        if state.skip_remaining: state.skip_remaining -= 1; return False
+        ok = await ping()  # hanya error jaringan yang dianggap gagal; error lain naik ke gather
+        if ok: state.failures = 0
+        else:
+            state.failures += 1
+            if state.failures >= BREAKER_THRESHOLD:
+                state.skip_remaining = min(BREAKER_MAX_SKIPS, 2 ** min(state.failures - BREAKER_THRESHOLD, BREAKER_MAX_SKIPS.bit_length()))
+                print(f"⚠️  {name} unreachable {state.failures}x, skipping next {state.skip_remaining} ping(s)")
+        return ok
 
     async def _ping_github(self) -> bool:
         try:
-            r = await asyncio.get_event_loop().run_in_executor(None, lambda: requests.get('https://api.github.com/zen', timeout=5))
-            return r.status_code == 200
-        except: return False
+            async with self.http.get('https://api.github.com/zen', timeout=PING_TIMEOUT) as r: return r.status == 200
+        except (aiohttp.ClientError, asyncio.TimeoutError): return False
 
     async def _ping_vercel(self) -> bool:
         try:
-            r = await asyncio.get_event_loop().run_in_executor(None, lambda: requests.get('https://api.vercel.com/v2/user', timeout=5))
-            return r.status_code in [200, 401]
-        except: return False
+            async with self.http.get('https://api.vercel.com/v2/user', timeout=PING_TIMEOUT) as r: return r.status in [200, 401]
+        except (aiohttp.ClientError, asyncio.TimeoutError): return False
 
     async def _ping_supabase(self) -> bool:
         try:
-            url = self.config['cloud_services']['supabase']['url']
-            r = await asyncio.get_event_loop().run_in_executor(None, lambda: requests.get(f"{url}/rest/v1/", headers={'apikey': self.config['secrets']['SUPABASE_KEY']}, timeout=5))
-            return r.status_code in [200, 401, 404]
-        except: return False
+            async with self.http.get(f"{self.supabase_url}/rest/v1/", headers=self._supabase_ping_headers, timeout=PING_TIMEOUT) as r: return r.status in [200, 401, 404]
+        except (aiohttp.ClientError, asyncio.TimeoutError): return False
 
     async def _ping_huggingface(self) -> bool:
         try:
-            r = await asyncio.get_event_loop().run_in_executor(None, lambda: requests.get('https://huggingface.co/api/whoami', timeout=5))
-            return r.status_code in [200, 401]
-        except: return False
+            async with self.http.get('https://huggingface.co/api/whoami', timeout=PING_TIMEOUT) as r: return r.status in [200, 401]
+        except (aiohttp.ClientError, asyncio.TimeoutError): return False
 
     async def _fetch_revenue_metrics(self) -> Dict:
         try:
             print("📊 Fetching REAL revenue metrics from Supabase...")
-            cfg = self.config; url = cfg['cloud_services']['supabase']['url']; key = cfg['secrets']['SUPABASE_KEY']
-            supabase: Client = create_client(url, key)
-            response = supabase.table('revenue_metrics').select("*").limit(1).single().execute()
+            if self.supabase is None: raise Exception("Supabase client not configured")
+            query = self.supabase.table('revenue_metrics').select("current_month,target,growth_rate,active_streams").limit(1).single()
+            response = await asyncio.get_event_loop().run_in_executor(None, query.execute)
             data = response.data
-            if data:
-                data.pop('id', None); data.pop('name', None); data.pop('updated_at', None)
-                print("✅ Real revenue data fetched."); return data
+            if data: print("✅ Real revenue data fetched."); return data
             else: raise Exception("No data found")
         except Exception as e:
             print(f"❌ Failed to fetch from Supabase: {e}. Using placeholder.")
@@ -122,40 +189,59 @@ class DesireEngine:
 
 class IntentionSystem:
     def __init__(self, belief_system: BeliefSystem, desire_engine: DesireEngine, config: Dict):
-        self.belief_system = belief_system; self.desire_engine = desire_engine; self.config = config; self.active_intentions = []
+        self.belief_system = belief_system; self.desire_engine = desire_engine; self.config = config; self.active_intentions = []; self.top_intentions = []
+        github = config['cloud_services']['github']; secrets = config.get('secrets') or {}
+        self.github_owner = github['owner']; self.github_repo = github['repo']; self.github_token = secrets.get('GITHUB_TOKEN')
+        self.vercel_token = secrets.get('VERCEL_TOKEN'); self.vercel_project_id = secrets.get('VERCEL_PROJECT_ID')
+        # Secret yang hilang dilaporkan sekali saat startup; intention terkait gagal sebelum request apa pun dikirim
+        missing = [k for k in ('GITHUB_TOKEN', 'VERCEL_TOKEN', 'VERCEL_PROJECT_ID') if not secrets.get(k)]
+        if missing: print(f"⚠️  Missing secrets {', '.join(missing)}: intentions that need them will be skipped.")
+        # URL, header, dan payload statis dibangun sekali; per panggilan hanya tinggal kirim
+        self._gh_workflow_url_tpl = f'https://api.github.com/repos/{self.github_owner}/{self.github_repo}/actions/workflows/{{wf}}/dispatches'
+        self._gh_headers = {'Authorization': f'token {self.github_token}', 'Accept': 'application/vnd.github.v3+json'}
+        self._vercel_url = "https://api.vercel.com/v13/deployments"; self._vercel_headers = {"Authorization": f"Bearer {self.vercel_token}", "Content-Type": "application/json"}
+        self._vercel_payload = {"name": "fmaa-bdi-agent-v1", "projectId": self.vercel_project_id, "target": "production", "gitSource": {"type": "github","repoId": 1037687440, "repo": self.github_repo, "owner": self.github_owner, "ref": "main"}}
+        self.session = requests.Session(); self.session.mount('https://', HTTPAdapter(pool_connections=10, pool_maxsize=10, max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[502, 503, 504])))
+        self._intention_builders = {'revenue_optimization': self._build_revenue_intent, 'agent_scaling': self._build_scaling_intent}
+        self._action_handlers = {'trigger_github_workflow': self._trigger_github_workflow, 'deploy_agents': self._deploy_agents}
+    def _build_revenue_intent(self, desire: Dict) -> Dict:
+        return {'action': 'trigger_github_workflow', 'workflow': 'bdi-action.yml', 'parameters': {'target_increase': str(desire['target_increase']), 'strategy': desire['strategy']}, 'priority': desire['priority']}
+    def _build_scaling_intent(self, desire: Dict) -> Dict:
+        return {'action': 'deploy_agents', 'platform': 'vercel', 'count': desire['target_agents'], 'priority': desire['priority']}
     async def form_intentions(self):
         desires = self.desire_engine.current_desires; intentions = []
         for desire in desires:
-            if desire['type'] == 'revenue_optimization': intentions.append({'action': 'trigger_github_workflow', 'workflow': 'bdi-action.yml', 'parameters': {'target_increase': str(desire['target_increase']), 'strategy': desire['strategy']}, 'priority': desire['priority']})
-            elif desire['type'] == 'agent_scaling': intentions.append({'action': 'deploy_agents', 'platform': 'vercel', 'count': desire['target_agents'], 'priority': desire['priority']})
-        intentions.sort(key=lambda x: x['priority'], reverse=True)
+            builder = self._intention_builders.get(desire['type'])
+            if builder: intentions.append(builder(desire))
+        self.top_intentions = heapq.nlargest(3, intentions, key=lambda x: x['priority'])
         self.active_intentions = intentions; print(f"⚡ Formed {len(intentions)} intentions")
     async def execute_intentions(self):
-        for intention in self.active_intentions[:3]:
+        for intention in self.top_intentions:
             try: await self._execute_single_intention(intention); print(f"✅ Executed: {intention['action']}")
             except Exception as e: print(f"❌ Execution failed: {intention['action']} - {e}")
     async def _execute_single_intention(self, intention: Dict):
-        if intention['action'] == 'trigger_github_workflow': await self._trigger_github_workflow(intention['workflow'], intention['parameters'])
-        elif intention['action'] == 'deploy_agents': await self._deploy_agents(intention)
-    async def _trigger_github_workflow(self, workflow: str, params: Dict):
-        print(f"🔄 Triggering REAL workflow: {workflow}")
-        cfg = self.config; owner = cfg['cloud_services']['github']['owner']; repo = cfg['cloud_services']['github']['repo']; token = cfg['secrets']['GITHUB_TOKEN']
-        url = f'https://api.github.com/repos/{owner}/{repo}/actions/workflows/{workflow}/dispatches'; headers = {'Authorization': f'token {token}', 'Accept': 'application/vnd.github.v3+json'}; payload = {'ref': 'main', 'inputs': params}
+        await self._action_handlers[intention['action']](intention)
+    async def _trigger_github_workflow(self, intention: Dict):
+        if not self.github_token: raise Exception("GITHUB_TOKEN not configured, workflow not triggered")
+        workflow = intention['workflow']; params = intention['parameters']; print(f"🔄 Triggering REAL workflow: {workflow}")
+        url = self._gh_workflow_url_tpl.format(wf=workflow); payload = {'ref': 'main', 'inputs': params}
         try:
-            loop = asyncio.get_event_loop(); r = await loop.run_in_executor(None, lambda: requests.post(url, headers=headers, json=payload, timeout=10))
+            loop = asyncio.get_event_loop(); r = await loop.run_in_executor(None, lambda: self.session.post(url, headers=self._gh_headers, json=payload, timeout=10))
             if r.status_code == 204: print("✅ Workflow triggered successfully")
-            else: print(f"❌ Failed to trigger workflow: {r.status_code} - {r.text}")
-        except Exception as e: print(f"❌ API Call Error: {e}")
+            else:
+                print(f"❌ Failed to trigger workflow: {r.status_code} - {r.text}")
+                if r.status_code >= 500: self.belief_system.invalidate_cloud_cache()
+        except Exception as e: print(f"❌ API Call Error: {e}"); self.belief_system.invalidate_cloud_cache()
     async def _deploy_agents(self, intention: Dict):
+        if not (self.vercel_token and self.vercel_project_id): raise Exception("VERCEL_TOKEN/VERCEL_PROJECT_ID not configured, deployment not triggered")
         print(f"🚀 Deploying {intention['count']} REAL agents to {intention['platform']}...")
-        cfg = self.config; token = cfg['secrets']['VERCEL_TOKEN']; project_id = cfg['secrets']['VERCEL_PROJECT_ID']; owner = cfg['cloud_services']['github']['owner']; repo = cfg['cloud_services']['github']['repo']
-        url = f"https://api.vercel.com/v13/deployments"; headers = {"Authorization": f"Bearer {token}", "Content-Type": "application/json"}
-        payload = {"name": f"fmaa-bdi-agent-v1", "projectId": project_id, "target": "production", "gitSource": {"type": "github","repoId": 1037687440, "repo": repo, "owner": owner, "ref": "main"}}
         try:
-            loop = asyncio.get_event_loop(); r = await loop.run_in_executor(None, lambda: requests.post(url, headers=headers, json=payload, timeout=20))
+            loop = asyncio.get_event_loop(); r = await loop.run_in_executor(None, lambda: self.session.post(self._vercel_url, headers=self._vercel_headers, json=self._vercel_payload, timeout=20))
             if r.status_code in [200, 201, 202]: print(f"✅ Vercel deployment triggered successfully! ID: {r.json().get('id')}")
-            else: print(f"❌ Vercel deployment failed: {r.status_code} - {r.text}")
-        except Exception as e: print(f"❌ Vercel API Call Error: {e}")
+            else:
+                print(f"❌ Vercel deployment failed: {r.status_code} - {r.text}")
+                if r.status_code >= 500: self.belief_system.invalidate_cloud_cache()
+        except Exception as e: print(f"❌ Vercel API Call Error: {e}"); self.belief_system.invalidate_cloud_cache()
 
 class FMAABDIMaster:
     def __init__(self):
@@ -163,7 +249,9 @@ class FMAABDIMaster:
         self.belief_system = BeliefSystem(self.config)
         self.desire_engine = DesireEngine(self.belief_system)
         self.intention_system = IntentionSystem(self.belief_system, self.desire_engine, self.config)
-        self.running = False; self.app = Flask(__name__)
+        self.running = False; self.http: Optional[aiohttp.ClientSession] = None; self.app = Quart(__name__)
+        self._stopped = asyncio.Event()  # memicu shutdown Hypercorn saat loop BDI berhenti
+        self._dashboard_tpl = Environment(autoescape=True).from_string(DASHBOARD_TEMPLATE); self._publish_snapshot()
         self._setup_dashboard_routes()
 
     def _load_config(self) -> Dict:
@@ -179,32 +267,65 @@ class FMAABDIMaster:
 
     async def run_agent(self):
         self.running = True; print("🚀 FMAA BDI Master Agent Starting..."); cycle_count = 0
-        while self.running:
-            try:
-                cycle_count += 1; print(f"\n🔄 BDI Cycle #{cycle_count}"); await self.bdi_cycle(); await asyncio.sleep(30)
-            except KeyboardInterrupt: print("\n👋 Shutting down BDI Agent..."); self.running = False
-            except Exception as e: print(f"❌ Unhandled Error in BDI cycle: {e}"); await asyncio.sleep(10)
+        # Satu ClientSession (keep-alive pool) untuk semua ping; harus dibuat di dalam event loop
+        self.http = aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=20, ttl_dns_cache=300, keepalive_timeout=60)); self.belief_system.http = self.http
+        try:
+            while self.running:
+                try:
+                    cycle_count += 1; print(f"\n🔄 BDI Cycle #{cycle_count}"); await self.bdi_cycle(); await asyncio.sleep(30)
+                except KeyboardInterrupt: print("\n👋 Shutting down BDI Agent..."); self.running = False
+                except Exception as e: print(f"❌ Unhandled Error in BDI cycle: {e}"); await asyncio.sleep(10)
+        finally:
+            await self.http.close(); self._stopped.set()
+
+    def _beliefs_view(self) -> Dict:
+        # Timestamp float hanya untuk internal; yang disajikan tetap 'last_updated' (ISO) seperti sebelumnya
+        view = dict(self.belief_system.beliefs); view['last_updated'] = format_ts(view.pop('last_updated_ts')); return view
+
+    def _publish_snapshot(self):
+        # Dipanggil sekali per siklus BDI. Snapshot dibangun utuh lalu diganti sekaligus, jadi request dashboard
+        # selalu melihat beliefs/desires/intentions dari siklus yang sama dan hanya memilih respons yang sudah jadi
+        beliefs = self._beliefs_view(); desires = self.desire_engine.current_desires; intentions = self.intention_system.active_intentions
+        as_html = lambda data: Markup(escape(pretty_json(data)))
+        beliefs_html = as_html(beliefs); desires_html = as_html(desires); intentions_html = as_html(intentions)
+        # Isi kedua route bergantung pada `running`, jadi body/ETag/gzip disiapkan untuk kedua nilainya
+        dashboard = {running: prepare_body(self._dashboard_tpl.render(last_updated=beliefs['last_updated'], beliefs_json=beliefs_html, desires_json=desires_html, intentions_json=intentions_html, running=running).encode()) for running in (True, False)}
+        api_status = {running: prepare_body(orjson.dumps({'status': 'running' if running else 'stopped', 'beliefs': beliefs, 'desires': len(desires), 'intentions': len(intentions)})) for running in (True, False)}
+        self._snapshot = {'beliefs': beliefs, 'desires': desires, 'intentions': intentions, 'dashboard': dashboard, 'api_status': api_status}
 
     def _setup_dashboard_routes(self):
         @self.app.route('/')
-        def dashboard(): return render_template_string(DASHBOARD_TEMPLATE, beliefs=self.belief_system.beliefs, desires=self.desire_engine.current_desires, intentions=self.intention_system.active_intentions, running=self.running)
+        async def dashboard(): return cacheable_response(self._snapshot['dashboard'][self.running], 'text/html')
         @self.app.route('/api/status')
-        def api_status(): return jsonify({'status': 'running' if self.running else 'stopped', 'beliefs': self.belief_system.beliefs, 'desires': len(self.desire_engine.current_desires), 'intentions': len(self.intention_system.active_intentions)})
+        async def api_status(): return cacheable_response(self._snapshot['api_status'][self.running], 'application/json')
 
-    def start_dashboard(self):
-        print("🌐 Starting dashboard at http://localhost:8080"); self.app.run(host='0.0.0.0', port=8080, debug=False)
+    async def start_dashboard(self):
+        print("🌐 Starting dashboard at http://localhost:8080"); config = HypercornConfig()
+        # Socket di-bind sendiri agar port yang terpakai gagal di sini, sebelum Hypercorn memulai task lifespan-nya
+        try: sock = socket.create_server(('0.0.0.0', 8080))
+        except OSError as e: print(f"⚠️  Dashboard unavailable ({e}), BDI agent keeps running without it."); return
+        config.bind = [f'fd://{sock.detach()}']
+        try: await serve(self.app, config, shutdown_trigger=self._stopped.wait)
+        except Exception as e: print(f"⚠️  Dashboard stopped ({e}), BDI agent keeps running without it.")
 
     async def bdi_cycle(self):
-        print("🔄 Starting BDI Cycle..."); await self.belief_system.update_beliefs(); await self.desire_engine.generate_desires(); await self.intention_system.form_intentions(); await self.intention_system.execute_intentions(); print("✅ BDI Cycle Complete")
+        print("🔄 Starting BDI Cycle...")
+        try: await self.belief_system.update_beliefs(); await self.desire_engine.generate_desires(); await self.intention_system.form_intentions(); await self.intention_system.execute_intentions(); print("✅ BDI Cycle Complete")
+        finally: self._publish_snapshot()
 
 master_agent = FMAABDIMaster()
 app = master_agent.app
 
+async def main():
+    # Loop BDI dan dashboard berbagi satu event loop (tanpa thread terpisah). Dashboard berjalan sebagai task
+    # tersendiri agar kegagalannya tidak menghentikan agen; saat Ctrl-C, Hypercorn ditutup lewat shutdown_trigger
+    dashboard = asyncio.create_task(master_agent.start_dashboard())
+    try: await master_agent.run_agent()
+    finally: master_agent._stopped.set(); await dashboard
+
 if __name__ == '__main__':
     print("🚀 Starting agent in local Termux mode...")
-    dashboard_thread = threading.Thread(target=master_agent.start_dashboard, daemon=True)
-    dashboard_thread.start()
     try:
-        asyncio.run(master_agent.run_agent())
+        asyncio.run(main())
     except KeyboardInterrupt:
         print("\n👋 Agent dihentikan.")
@@ -31,7 +31,8 @@ pkg install -y \
     termux-api \
     python-virtualenv \
     jq \
-    clang
+    clang \
+    rust # Dibutuhkan untuk build orjson (tidak ada wheel Android)
 log_success "Paket minimal terinstal (< 20MB)"
 
 # ===== FASE 2: SETUP PYTHON ULTRA-LIGHT =====
@@ -46,11 +47,14 @@ python -m venv venv
 source venv/bin/activate
 
 log_info "Menginstal dependensi Python..."
+# orjson tidak punya wheel Android, jadi dikompilasi di perangkat memakai toolchain Rust dari pkg di atas
 pip install --no-cache-dir \
     requests \
     aiohttp \
     python-dotenv \
-    flask \
+    quart \
+    hypercorn \
+    orjson \
     websockets \
     pyyaml \
     psutil # Opsional, untuk monitoring resource